@@ -1,63 +1,207 @@
 import os
+import atexit
 import hashlib
 import logging
+import logging.handlers
+import mmap
+import queue
+import sqlite3
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
+
+try:
+    import blake3  # optional: multithreaded SIMD tree hash, much faster than SHA-256
+except ImportError:
+    blake3 = None
+
+try:
+    from _hashlib import openssl_sha256 as sha256_ctor  # OpenSSL build: SHA-NI where the CPU has it
+except ImportError:
+    # Builds without OpenSSL still get CPython's built-in C implementation (_sha2),
+    # never a pure-Python one, so no separate compiled fallback is needed here
+    from hashlib import sha256 as sha256_ctor
+
 # --- CONFIGURATION ---
 dir1 = r"C:\Users\demet\OneDrive\Documents\GitHub\github_repo_importer\temp_files_from_server\3-30-23_BACKUP_WINTER 23 SEMESTER-FILES"
 dir2 = r"C:\Users\demet\OneDrive\Documents\GitHub\github_repo_importer\temp_files_from_server\WINTER 2023 SEMESTER CLASS FILES"
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 script_dir = Path(__file__).parent if '__file__' in globals() else Path(sys.argv[0]).resolve().parent
 log_path = script_dir / f"compare_directories_{timestamp}.log"
+# hashlib releases the GIL while hashing, so threads overlap disk reads with hashing
+HASH_WORKERS = (os.cpu_count() or 1) * 2
+# Digests are only used to check whether two files are identical, so any fast hash will do
+HASH_ALGO = "blake3" if blake3 is not None else "sha256"
+MMAP_THRESHOLD = 128 * 1024  # smaller files are read in one go instead of mapped
+HASH_BUFFER_SIZE = 1024 * 1024  # read window for the pre-3.11 hashing fallback
+# Small files are hashed in batches so each worker task carries a useful amount of I/O
+BATCH_MAX_FILES = 64
+BATCH_MAX_BYTES = 4 * 1024 * 1024
+# Treat files with identical size and mtime as equal without hashing them (rsync quick check).
+# Set to False to force a full content comparison of every common file.
+TRUST_MTIME = True
+# Digests are remembered across runs keyed by (path, size, mtime_ns); set to None to disable
+HASH_CACHE_PATH = Path.home() / ".cache" / "compare_dirs" / "hashes.db"
 
 
 # --- LOGGING SETUP ---
-logging.basicConfig(
-    filename=log_path,
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# Callers (including the hashing workers) only enqueue records; a background
+# listener thread does the file/console writes so logging never serializes them
+file_handler = logging.FileHandler(log_path, encoding='utf-8')
+file_handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', '%Y-%m-%d %H:%M:%S'))
 console = logging.StreamHandler()
 console.setLevel(logging.INFO)
 formatter = logging.Formatter('%(message)s')
 console.setFormatter(formatter)
-logging.getLogger().addHandler(console)
+
+log_queue = queue.SimpleQueue()
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+logging.getLogger().setLevel(logging.INFO)
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, console, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 # --- UTILS ---
-def hash_file(path, algo="sha256"):
-    logging.info(f"🔄 Hashing file: {path}")
-    h = hashlib.new(algo)
+def _blake3_digest(f):
+    if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+        return blake3.blake3(f.read()).digest()
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return blake3.blake3(mm, max_threads=blake3.blake3.AUTO).digest()
+
+def _hash_constructor(algo):
+    # sha256 is resolved once at import instead of going through hashlib.new's name lookup per file
+    return sha256_ctor if algo == "sha256" else lambda: hashlib.new(algo)
+
+def _readinto_digest(f, algo):
+    # Reuse one buffer for the whole file instead of allocating a bytes object per chunk
+    h = _hash_constructor(algo)()
+    buf = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buf)
+    while n := f.readinto(buf):
+        h.update(view[:n])
+    return h.digest()
+
+def hash_file(path, algo=HASH_ALGO):
+    """Return the raw digest of a file (bytes, half the size of hex), or None if it can't be read."""
+    logging.debug("🔄 Hashing file: %s", path)
     try:
-        with open(path, "rb") as f:
-            while chunk := f.read(8192):
-                h.update(chunk)
-        digest = h.hexdigest()
-        logging.info(f"   ✔ Hash complete: {digest}")
+        # Unbuffered: every reader below pulls large blocks itself, no need to double-buffer
+        with open(path, "rb", buffering=0) as f:
+            if algo == "blake3":
+                digest = _blake3_digest(f)
+            elif hasattr(hashlib, "file_digest"):  # Python 3.11+
+                digest = hashlib.file_digest(f, _hash_constructor(algo)).digest()
+            else:
+                digest = _readinto_digest(f, algo)
+        logging.debug("   ✔ Hash complete: %s", digest.hex())
         return digest
     except Exception as e:
         logging.warning(f"   ❌ Failed to hash file: {path} — {e}")
-        return f"ERROR: {e}"
+        return None
+
+def scan_tree(path):
+    """Yield (full_path, stat) for every file below *path*, one stat per entry."""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from scan_tree(entry.path)
+                    elif entry.is_file():
+                        yield entry.path, entry.stat()
+                except OSError as e:
+                    logging.warning(f"   ❌ Failed to read entry: {entry.path} — {e}")
+    except OSError as e:
+        logging.warning(f"   ❌ Failed to scan directory: {path} — {e}")
 
 def collect_files(base_dir):
     logging.info(f"\n📁 Scanning directory: {base_dir}")
     file_map = {}
     base_path = Path(base_dir).resolve()
-    count = 0
-    for root, _, files in os.walk(base_path):
-        for name in files:
-            full_path = Path(root) / name
-            rel_path = full_path.relative_to(base_path)
-            logging.info(f"→ Processing file: {rel_path}")
-            file_map[str(rel_path)] = {
-                "full": str(full_path),
-                "hash": hash_file(full_path)
-            }
-            count += 1
+    for full_path, st in scan_tree(base_path):
+        rel_path = os.path.relpath(full_path, base_path)
+        logging.debug("→ Processing file: %s", rel_path)
+        file_map[rel_path] = {
+            "full": full_path,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "hash": None,  # filled in lazily, only when the quick check is inconclusive
+        }
+    count = len(file_map)
     logging.info(f"✔️ Finished scanning {base_dir} — {count} files found.\n")
     return file_map
 
+def hash_files_batch(paths, algo=HASH_ALGO):
+    """Hash several files in one worker task; digests are returned in input order."""
+    return [hash_file(p, algo) for p in paths]
+
+def batch_by_size(entries):
+    """Group file_map entries into batches of similar size; large files get their own batch."""
+    batches, batch, batch_bytes = [], [], 0
+    for entry in sorted(entries, key=lambda e: e["size"]):
+        if entry["size"] >= BATCH_MAX_BYTES:
+            batches.append([entry])
+            continue
+        batch.append(entry)
+        batch_bytes += entry["size"]
+        if len(batch) >= BATCH_MAX_FILES or batch_bytes >= BATCH_MAX_BYTES:
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+def open_hash_cache(path=HASH_CACHE_PATH):
+    """Open (creating if needed) the persistent digest cache; returns None if unavailable."""
+    if path is None:
+        return None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT, algo TEXT, size INTEGER, mtime_ns INTEGER, digest BLOB,"
+            " PRIMARY KEY (path, algo))"
+        )
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"⚠️ Hash cache unavailable ({path}) — {e}")
+        return None
+
+def hash_entries(entries, cache=None):
+    """Fill in the "hash" field of each file_map entry, hashing cache misses in parallel."""
+    pending = entries
+    if cache is not None:
+        pending = []
+        for entry in entries:
+            row = cache.execute(
+                "SELECT digest FROM hashes WHERE path = ? AND algo = ? AND size = ? AND mtime_ns = ?",
+                (entry["full"], HASH_ALGO, entry["size"], entry["mtime_ns"]),
+            ).fetchone()
+            if row:
+                entry["hash"] = row[0]
+            else:
+                pending.append(entry)
+        logging.info(f"💾 {len(entries) - len(pending)} of {len(entries)} digests served from cache")
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as ex:
+        futs = {
+            ex.submit(hash_files_batch, [entry["full"] for entry in batch]): batch
+            for batch in batch_by_size(pending)
+        }
+        for fut in as_completed(futs):
+            for entry, digest in zip(futs[fut], fut.result()):
+                entry["hash"] = digest
+
+    if cache is not None:
+        with cache:  # one transaction for the whole batch
+            cache.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                [(e["full"], HASH_ALGO, e["size"], e["mtime_ns"], e["hash"])
+                 for e in pending if e["hash"] is not None],
+            )
+
 # --- MAIN COMPARISON LOGIC ---
 def compare_directories(dir1, dir2):
     logging.info("=====================================")
@@ -71,14 +215,33 @@ def compare_directories(dir1, dir2):
 
     logging.info("📊 Analyzing file differences...\n")
 
-    only_in_dir1 = sorted(set(files1) - set(files2))
-    only_in_dir2 = sorted(set(files2) - set(files1))
-    common_files = set(files1) & set(files2)
+    # dict views support set operations directly, no intermediate set copies
+    keys1, keys2 = files1.keys(), files2.keys()
+    only_in_dir1 = sorted(keys1 - keys2)
+    only_in_dir2 = sorted(keys2 - keys1)
+    common_files = keys1 & keys2
+
+    # rsync-style quick check: different sizes can't match, same size+mtime is
+    # taken as identical; only the remaining candidates are actually hashed
+    size_mismatch = {f for f in common_files if files1[f]['size'] != files2[f]['size']}
+    candidates = [
+        f for f in common_files - size_mismatch
+        if not TRUST_MTIME or files1[f]['mtime_ns'] != files2[f]['mtime_ns']
+    ]
+    logging.info(f"🔄 Hashing {len(candidates)} of {len(common_files)} common files "
+                 f"({len(size_mismatch)} differ in size)...\n")
+    cache = open_hash_cache()
+    try:
+        hash_entries([files1[f] for f in candidates] + [files2[f] for f in candidates], cache)
+    finally:
+        if cache is not None:
+            cache.close()
 
-    diff_content = sorted([
-        f for f in common_files
-        if files1[f]['hash'] != files2[f]['hash']
-    ])
+    # A file that couldn't be hashed can't be shown to match, so it's reported as different
+    diff_content = sorted(size_mismatch | {
+        f for f in candidates
+        if files1[f]['hash'] is None or files1[f]['hash'] != files2[f]['hash']
+    })
 
     # Report differences
     logging.info(f"\n📁 FILES ONLY IN BACKUP ({len(only_in_dir1)}):")
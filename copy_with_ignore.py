@@ -1,10 +1,15 @@
 import os
+import atexit
+import queue
 import shutil
 import logging
+import logging.handlers
 from datetime import datetime
 import fnmatch
+import functools
+import re
 import csv
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # ==== CONFIGURATION ====
 SOURCE_DIR = r"Z:\Meech's stuff\UM-Dearborn-All Projects and Class Files"
@@ -13,9 +18,20 @@ DEST_DIR = r"C:\Users\demet\OneDrive\Documents\GitHub\github_repo_importer\temp_
 IGNORE_FOLDER_PATTERNS = [".vs", "__pycache__", ".git", "Debug", "bin"]
 IGNORE_FILE_PATTERNS = ["*.log", "Thumbs.db", ".DS_Store", "~$*", "*.vcxproj*", "*.ova", "*.iso", "*.ovf"]
 
+# Copies run concurrently so per-file open/close latency on the network share overlaps
+COPY_WORKERS = 16
+
 # ==== MATCHING HELPERS ====
+@functools.lru_cache(maxsize=None)
+def compile_globs(patterns):
+    """Fold a tuple of glob patterns into one regex (case-insensitive on Windows, like fnmatch)."""
+    if not patterns:
+        return re.compile(r"(?!)")  # matches nothing
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), flags)
+
 def matches_any_glob(name, pattern_list):
-    return any(fnmatch.fnmatch(name, pattern) for pattern in pattern_list)
+    return compile_globs(tuple(pattern_list)).match(name) is not None
 
 # ==== SETUP LOGGING ====
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,88 +39,126 @@ timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 log_file = os.path.join(script_dir, f"copy_log_{timestamp}.log")
 skipped_files = []  # List of (path, reason)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Hot paths only enqueue records; a background listener formats and writes them,
+# so the copy workers don't serialize on the file/console handler locks
+log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+log_handlers = [logging.FileHandler(log_file, encoding='utf-8'), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+logging.getLogger().setLevel(logging.INFO)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 # ==== PRE-SCAN TO COUNT FILES & SIZE ====
 def get_copy_plan(src_dir, ignore_folders, ignore_files):
     total_files = 0
     total_size = 0
     plan = []
+    folder_re = compile_globs(tuple(ignore_folders))
+    file_re = compile_globs(tuple(ignore_files))
 
-    for root, dirs, files in os.walk(src_dir):
-        for d in list(dirs):
-            if matches_any_glob(d, IGNORE_FOLDER_PATTERNS):
-                full_path = os.path.join(root, d)
-                skipped_files.append((full_path, "Ignored folder pattern"))
-                logging.info(f"IGNORED FOLDER: {full_path}")
-                dirs.remove(d)
-
-        for file in files:
-            if matches_any_glob(file, IGNORE_FILE_PATTERNS):
-                full_path = os.path.join(root, file)
-                skipped_files.append((full_path, "Ignored file pattern"))
-                logging.info(f"IGNORED FILE: {full_path}")
+    def scan(folder):
+        nonlocal total_files, total_size
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError as e:
+            logging.error(f"Unexpected error scanning folder: {folder} | {e}")
+            skipped_files.append((folder, f"Access error: {e}"))
+            return
+
+        for entry in entries:
+            # Ignore patterns are checked before anything is stat'ed
+            if entry.is_dir(follow_symlinks=False):
+                if folder_re.match(entry.name):
+                    skipped_files.append((entry.path, "Ignored folder pattern"))
+                    logging.info(f"IGNORED FOLDER: {entry.path}")
+                else:
+                    scan(entry.path)
                 continue
 
-            raw_path = os.path.join(root, file)
-            src_path = os.path.normpath(raw_path)
-            win_path = f"\\\\?\\{src_path}"
-
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    if not os.path.exists(win_path):
-                        logging.warning(f"File does not exist: {win_path}")
-                        skipped_files.append((win_path, "File does not exist"))
-                        break
-
-                    size = os.path.getsize(win_path)
-                    plan.append((win_path, size))
-                    total_files += 1
-                    total_size += size
-                    break
-                except FileNotFoundError as e:
-                    if attempt < max_retries - 1:
-                        time.sleep(0.2)
-                        continue
-                    logging.warning(f"File not found during scan after retries: {win_path} | {e}")
-                    skipped_files.append((win_path, f"FileNotFoundError: {e}"))
-                except Exception as e:
-                    logging.error(f"Unexpected error accessing file: {win_path} | {e}")
-                    skipped_files.append((win_path, f"Access error: {e}"))
-                    break
+            if file_re.match(entry.name):
+                skipped_files.append((entry.path, "Ignored file pattern"))
+                logging.debug("IGNORED FILE: %s", entry.path)
+                continue
+
+            try:
+                if not entry.is_file():
+                    continue
+                size = entry.stat().st_size  # cached by scandir on Windows, one stat elsewhere
+            except OSError as e:
+                logging.error(f"Unexpected error accessing file: {entry.path} | {e}")
+                skipped_files.append((entry.path, f"Access error: {e}"))
+                continue
 
+            plan.append((entry.path, size))
+            total_files += 1
+            total_size += size
+
+    # Scan through the extended-length prefix so every DirEntry path is long-path safe
+    scan(f"\\\\?\\{os.path.normpath(os.path.abspath(src_dir))}" if os.name == "nt" else src_dir)
     return plan, total_files, total_size
 
 # ==== COPY LOGIC ====
+def fast_copy(src, dst):
+    """Copy file contents and metadata, keeping the data in the kernel where possible."""
+    if os.name == "nt":
+        import ctypes
+
+        # CopyFileW understands the \\?\ long-path prefix and skips Python's read/write loop
+        if not ctypes.windll.kernel32.CopyFileW(ctypes.c_wchar_p(src), ctypes.c_wchar_p(dst), False):
+            raise ctypes.WinError()
+    else:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while n := os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    copied += n
+            complete = copied == size
+        except (AttributeError, OSError):
+            # No copy_file_range (old Python/kernel, cross-device on some kernels)
+            complete = False
+        if not complete:
+            # Also taken when copy_file_range returned 0 before EOF, which some file
+            # systems do: shutil's sendfile/read path rewrites the whole file
+            shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def copy_one(src_file, size, src_dir, dest_dir):
+    """Copy a single planned file into dest_dir; returns True on success."""
+    src_file_clean = src_file[4:] if src_file.startswith('\\\\?\\') else src_file
+    rel_path = os.path.relpath(src_file_clean, src_dir)
+    dest_file = os.path.join(dest_dir, rel_path)
+
+    # Extended-length prefix only on Windows; on POSIX it would make the path invalid
+    long_dest_file = f"\\\\?\\{os.path.normpath(dest_file)}" if os.name == "nt" else dest_file
+    long_dest_folder = os.path.dirname(long_dest_file)
+
+    try:
+        os.makedirs(long_dest_folder, exist_ok=True)
+        fast_copy(src_file, long_dest_file)
+        logging.debug("COPIED: %s (%.1f KB)", rel_path, size / 1024)
+        return True
+    except Exception as e:
+        logging.error(f"ERROR copying {src_file} -> {long_dest_file}: {e}")
+        skipped_files.append((src_file, f"Copy error: {e}"))
+        return False
+
 def copy_files_with_progress(plan, src_dir, dest_dir):
     copied_files = 0
     copied_bytes = 0
 
-    for src_file, size in plan:
-        src_file_clean = src_file[4:] if src_file.startswith('\\\\?\\') else src_file
-        rel_path = os.path.relpath(src_file_clean, src_dir)
-        dest_file = os.path.join(dest_dir, rel_path)
-
-        long_dest_file = f"\\\\?\\{os.path.normpath(dest_file)}"
-        long_dest_folder = os.path.dirname(long_dest_file)
-
-        try:
-            os.makedirs(long_dest_folder, exist_ok=True)
-            shutil.copy2(src_file, long_dest_file)
-            copied_files += 1
-            copied_bytes += size
-            logging.info(f"COPIED: {rel_path} ({size / 1024:.1f} KB)")
-        except Exception as e:
-            logging.error(f"ERROR copying {src_file} -> {long_dest_file}: {e}")
-            skipped_files.append((src_file, f"Copy error: {e}"))
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        futures = {ex.submit(copy_one, src_file, size, src_dir, dest_dir): size for src_file, size in plan}
+        for future in as_completed(futures):
+            if future.result():
+                copied_files += 1
+                copied_bytes += futures[future]
 
     return copied_files, copied_bytes
 
@@ -1,16 +1,22 @@
 import os
+import functools
 import pathlib
 import logging
 import sys
 from datetime import datetime
-import math
 import platform
+from concurrent.futures import ThreadPoolExecutor
 
 # === OPTIONAL HARDCODED TARGET DIRECTORY === 
 # (if command line argument of file path is passed in, TARGET_DIR will be overwritten to use that value)
 # this gives the program max flexibility
 TARGET_DIR = None  # e.g., "~/OneDrive/Documents/GitHub/github_repo_importer/projects"
 
+# Walks of sibling subdirectories are latency-bound (especially on network drives),
+# so they are run concurrently once there are more than a handful of them
+MAX_SCAN_WORKERS = 32
+PARALLEL_SCAN_THRESHOLD = 4
+
 # === SETUP SCRIPT DIRECTORY AND LOGGING ===
 script_dir = pathlib.Path(__file__).parent.resolve()
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -22,19 +28,32 @@ logging.basicConfig(
     format='%(asctime)s [%(levelname)s] %(message)s',
 )
 
+_SIZE_UNITS = (("B", 1), ("KB", 1 << 10), ("MB", 1 << 20), ("GB", 1 << 30), ("TB", 1 << 40))
+
 def format_size(bytes_size):
-    """Convert bytes into a human-readable KB, MB, or GB format."""
+    """Convert bytes into a human-readable KB, MB, GB, or TB format."""
     if bytes_size < 1024:
         return f"{bytes_size} B"
-    elif bytes_size < 1024 ** 2:
-        return f"{bytes_size / 1024:.2f} KB"
-    elif bytes_size < 1024 ** 3:
-        return f"{bytes_size / (1024 ** 2):.2f} MB"
-    else:
-        return f"{bytes_size / (1024 ** 3):.2f} GB"
+    # every unit is 2**10 larger than the previous one, so the bit length picks the unit
+    unit, divisor = _SIZE_UNITS[min(4, (bytes_size.bit_length() - 1) // 10)]
+    return f"{bytes_size / divisor:.2f} {unit}"
+
+def get_volume_root(path):
+    """Return the drive root (Windows) or mount point (elsewhere) that holds *path*."""
+    if platform.system() == 'Windows':
+        return pathlib.Path(path).drive + '\\'
+    path = os.path.realpath(path)
+    while not os.path.ismount(path):
+        path = os.path.dirname(path)
+    return path
 
 def get_allocation_unit_size(path):
-    """Determine filesystem cluster size (allocation unit) depending on OS."""
+    """Determine filesystem cluster size (allocation unit) for the volume holding *path*."""
+    return _volume_allocation_unit_size(get_volume_root(path))
+
+@functools.lru_cache(maxsize=32)
+def _volume_allocation_unit_size(root_path):
+    """Query the cluster size of a volume; cached, so each drive is asked only once."""
     if platform.system() == 'Windows':
         import ctypes
 
@@ -43,7 +62,6 @@ def get_allocation_unit_size(path):
         num_free_clusters = ctypes.c_ulong()
         total_num_clusters = ctypes.c_ulong()
 
-        root_path = pathlib.Path(path).drive + '\\'
         result = ctypes.windll.kernel32.GetDiskFreeSpaceW(
             ctypes.c_wchar_p(root_path),
             ctypes.byref(sectors_per_cluster),
@@ -58,26 +76,39 @@ def get_allocation_unit_size(path):
         return sectors_per_cluster.value * bytes_per_sector.value
 
     else:
-        stat = os.statvfs(path)
+        stat = os.statvfs(root_path)
         return stat.f_frsize  # fragment size
 
-def get_directory_sizes(path, allocation_unit):
-    """Recursively calculate total size and size-on-disk of all files in a directory."""
-    total_size = 0
-    size_on_disk = 0
+def iter_file_sizes(path):
+    """Yield the size of every file under a directory, using the stat cached on each DirEntry."""
     try:
-        for root, dirs, files in os.walk(path, topdown=True, followlinks=False):
-            for f in files:
+        with os.scandir(path) as it:
+            for entry in it:
                 try:
-                    fp = os.path.join(root, f)
-                    size = os.path.getsize(fp)
-                    total_size += size
-                    size_on_disk += math.ceil(size / allocation_unit) * allocation_unit
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from iter_file_sizes(entry.path)
+                    elif entry.is_file():
+                        # symlinked files count at their target's size, as os.path.getsize did
+                        yield entry.stat().st_size
                 except Exception as fe:
-                    logging.warning(f"⚠️ Could not read size of file {fp}: {fe}")
+                    logging.warning(f"⚠️ Could not read size of file {entry.path}: {fe}")
     except Exception as e:
         logging.error(f"❌ Error walking through {path}: {e}")
-        return 0, 0
+
+def get_directory_sizes(path, allocation_unit):
+    """Recursively calculate total size and size-on-disk of all files in a directory."""
+    total_size = 0
+    size_on_disk = 0
+    mask = allocation_unit - 1
+    if allocation_unit & mask == 0:
+        # Cluster sizes are powers of two in practice, so round up with a bit mask
+        for size in iter_file_sizes(path):
+            total_size += size
+            size_on_disk += (size + mask) & ~mask
+    else:
+        for size in iter_file_sizes(path):
+            total_size += size
+            size_on_disk += -(-size // allocation_unit) * allocation_unit
     return total_size, size_on_disk
 
 def list_subdirectory_sizes(base_path):
@@ -103,13 +134,18 @@ def list_subdirectory_sizes(base_path):
     total_bytes = 0
     total_disk = 0
 
-    for item in base_path.iterdir():
-        if item.is_dir() and not item.is_symlink():
-            size_bytes, disk_bytes = get_directory_sizes(item, allocation_unit)
-            dir_sizes.append((item.name, size_bytes, disk_bytes))
-            total_bytes += size_bytes
-            total_disk += disk_bytes
-            logging.info(f"📁 {item.name}: actual={format_size(size_bytes)}, disk={format_size(disk_bytes)}")
+    subdirs = [item for item in base_path.iterdir() if item.is_dir() and not item.is_symlink()]
+    if len(subdirs) > PARALLEL_SCAN_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS) as ex:
+            results = list(ex.map(lambda d: get_directory_sizes(d, allocation_unit), subdirs))
+    else:
+        results = [get_directory_sizes(d, allocation_unit) for d in subdirs]
+
+    for item, (size_bytes, disk_bytes) in zip(subdirs, results):
+        dir_sizes.append((item.name, size_bytes, disk_bytes))
+        total_bytes += size_bytes
+        total_disk += disk_bytes
+        logging.info(f"📁 {item.name}: actual={format_size(size_bytes)}, disk={format_size(disk_bytes)}")
 
     dir_sizes.sort(key=lambda x: x[1], reverse=True)
 
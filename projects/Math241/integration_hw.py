@@ -1,5 +1,23 @@
+try:
+    import numpy as np  # optional: evaluate f on all points in one vectorised call
+except ImportError:
+    np = None
+
 def integrate(f, a, b, steps=1000):
+    """Composite Simpson's rule: error O(dx**4), versus O(dx) for a left Riemann sum."""
+    if steps % 2:
+        raise ValueError("Simpson's rule needs an even number of steps")
     dx = (b - a) / steps
-    return sum(f(a + i*dx) * dx for i in range(steps))
+    if np is not None:
+        xs = a + np.arange(steps + 1) * dx
+        try:
+            y = np.asarray(f(xs), dtype=float)     # one call when f accepts arrays
+        except (TypeError, ValueError):            # scalar-only f: math.sin, or one that
+            y = None                               # branches (`if x > 0.5`) on its argument
+        if y is None or y.shape != xs.shape:       # or a constant like lambda x: 5.0
+            y = np.fromiter((f(x) for x in xs), float, len(xs))
+        return float(y[0] + y[-1] + 4 * y[1:-1:2].sum() + 2 * y[2:-1:2].sum()) * dx / 3
+    y = [f(a + i*dx) for i in range(steps + 1)]
+    return (y[0] + y[-1] + 4 * sum(y[1:-1:2]) + 2 * sum(y[2:-1:2])) * dx / 3
 
 print(integrate(lambda x: x**2, 0, 1))
@@ -2,17 +2,29 @@ import os
 import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson  # optional: C/SIMD JSON codec, several times faster than json
+except ImportError:
+    orjson = None
+
 # === CONFIGURATION ===
 # Root folder that contains Git repositories (Windows path)
 GITHUB_REPOS_ROOT = r"C:\Users\demet\OneDrive\Documents\GitHub\github_repo_importer\projects"
 
 SOURCE_EXTENSIONS = {'.py', '.cpp', '.c', '.java', '.asm', '.ipynb', '.js', '.ts', '.rs'}
+SOURCE_EXT_TUPLE = tuple(SOURCE_EXTENSIONS)  # str.endswith checks a tuple in one call
 EXCLUDE_DIRS = {'docs', 'textbooks', 'slides', '__pycache__', '.git'}
 MAX_LINES_PER_FILE = 40
+SNIPPET_READ_CHUNK = 16 * 1024  # files are read in chunks of this size until the lines are in
+SNIPPET_MAX_BYTES = 1024 * 1024  # most bytes read per file, however long its lines are
 MAX_TOTAL_SNIPPETS_PER_PROJECT = 10
+MAX_TOTAL_SNIPPETS_PER_REPO = None  # e.g. 50 to stop scanning a repo early; None = no cap
+SCAN_WORKERS = (os.cpu_count() or 1) * 2  # repositories scanned in parallel (I/O‑bound)
+WRITE_WORKERS = 8  # summary JSON files written in parallel
 
 # Each repository will get its own JSON summary under this directory
 OUTPUT_DIR = 'project_summaries_jsons'
@@ -35,80 +47,144 @@ def setup_logging(level: str = 'INFO', log_file: str | None = None) -> None:
     logging.getLogger(__name__).debug('Logging initialised (level=%s, log_file=%s)', level.upper(), log_file)
 
 
-def is_source_file(filename: str) -> bool:
-    """Return True if *filename* has one of the allowed source extensions."""
-    return any(filename.endswith(ext) for ext in SOURCE_EXTENSIONS)
-
-
-def gather_code_snippets(project_path: str, logger: logging.Logger):
-    """Collect up to MAX_TOTAL_SNIPPETS_PER_PROJECT snippets from source files in *project_path*."""
+def iter_source_dirs(top: str):
+    """
+    Yield (dir_path, source_file_names) for *top* and every sub‑directory not in
+    EXCLUDE_DIRS, in os.walk order. One os.scandir per directory; the entries
+    carry their file type, so nothing is stat'ed separately.
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(top) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDE_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(SOURCE_EXT_TUPLE) and entry.is_file():
+                    files.append(entry.name)
+    except OSError:
+        return  # unreadable directory: skipped, as os.walk does
+    yield top, files
+    for path in subdirs:
+        yield from iter_source_dirs(path)
+
+
+def read_snippet(filepath: str) -> str:
+    """
+    Return the first MAX_LINES_PER_FILE lines of *filepath*. Chunks are read only
+    until that many newlines have been seen, so a big file costs a few KB; a
+    file whose lines are huge (minified or generated) stops at SNIPPET_MAX_BYTES,
+    dropping the line the cap cut through unless it is the only one.
+    """
+    data = bytearray()
+    newlines = 0
+    with open(filepath, 'rb') as f:
+        while newlines < MAX_LINES_PER_FILE and len(data) < SNIPPET_MAX_BYTES:
+            chunk = f.read(min(SNIPPET_READ_CHUNK, SNIPPET_MAX_BYTES - len(data)))
+            if not chunk:
+                break
+            data += chunk
+            newlines += chunk.count(b'\n')
+        truncated = newlines < MAX_LINES_PER_FILE and len(data) >= SNIPPET_MAX_BYTES and f.read(1)
+    text = data.decode('utf-8', errors='ignore')
+    text = text.replace('\r\n', '\n').replace('\r', '\n')  # universal newlines
+    lines = text.split('\n', MAX_LINES_PER_FILE)[:MAX_LINES_PER_FILE]
+    if truncated and len(lines) > 1:
+        lines.pop()
+    return '\n'.join(lines)
+
+
+def gather_code_snippets(project_path: str, logger: logging.Logger,
+                         limit: int = MAX_TOTAL_SNIPPETS_PER_PROJECT):
+    """Collect up to *limit* snippets from source files in *project_path*; the walk stops at the limit."""
     logger.debug('Scanning project path: %s', project_path)
     snippets = []
     count = 0
-    for root, _, files in os.walk(project_path):
+    # paths below the root are reported relative to it by slicing off this prefix
+    root_prefix = os.path.join(GITHUB_REPOS_ROOT, '')
+    for root, files in iter_source_dirs(project_path):
         for file in files:
-            if is_source_file(file):
-                filepath = os.path.join(root, file)
-                logger.debug('Reading file: %s', filepath)
-                try:
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()[:MAX_LINES_PER_FILE]
-                    if lines:
+            filepath = os.path.join(root, file)
+            logger.debug('Reading file: %s', filepath)
+            try:
+                text = read_snippet(filepath)
+                if text:
+                    if filepath.startswith(root_prefix):
+                        relative_path = filepath[len(root_prefix):]
+                    else:
                         relative_path = os.path.relpath(filepath, GITHUB_REPOS_ROOT)
-                        snippets.append({
-                            'file': relative_path,
-                            'snippet': ''.join(lines).strip()
-                        })
-                        count += 1
-                        logger.debug('Added snippet from %s (%d/%d)', relative_path,
-                                     count, MAX_TOTAL_SNIPPETS_PER_PROJECT)
-                        if count >= MAX_TOTAL_SNIPPETS_PER_PROJECT:
-                            logger.info('Reached snippet limit for project %s', project_path)
-                            return snippets
-                except Exception as exc:
-                    logger.exception('Error processing file %s: %s', filepath, exc)
+                    snippets.append({
+                        'file': relative_path,
+                        'snippet': text.strip()
+                    })
+                    count += 1
+                    logger.debug('Added snippet from %s (%d/%d)', relative_path, count, limit)
+                    if count >= limit:
+                        logger.info('Reached snippet limit for project %s', project_path)
+                        return snippets
+            except Exception as exc:
+                logger.exception('Error processing file %s: %s', filepath, exc)
     return snippets
 
 
+def scan_repo(repo_name: str, repo_path: str, logger: logging.Logger) -> list[dict]:
+    """Return the project summaries for one repository (empty if it has no source files)."""
+    logger.debug('Processing repository: %s', repo_name)
+    summaries_for_repo: list[dict] = []
+    remaining = MAX_TOTAL_SNIPPETS_PER_REPO
+    # Excluded sub‑directories are pruned by iter_source_dirs
+    for root, relevant_files in iter_source_dirs(repo_path):
+        if remaining is not None and remaining <= 0:
+            logger.info('Reached snippet limit for repository %s', repo_name)
+            break  # leaves the rest of the repo unscanned
+        if relevant_files:
+            # root is repo_path itself or a path below it
+            rel_path = root[len(repo_path) + 1:] or '.'
+            logger.debug('Found project folder with source files: %s', root)
+            limit = MAX_TOTAL_SNIPPETS_PER_PROJECT
+            if remaining is not None:
+                limit = min(limit, remaining)
+            snippets = gather_code_snippets(root, logger, limit)
+            if snippets:
+                if remaining is not None:
+                    remaining -= len(snippets)
+                project_summary = {
+                    'repo': repo_name,
+                    'folder': rel_path,
+                    'code_files': [os.path.join(rel_path, f) for f in relevant_files],
+                    'snippets': snippets
+                }
+                summaries_for_repo.append(project_summary)
+                logger.info('Added summary for project %s/%s (snippets=%d)',
+                            repo_name, rel_path, len(snippets))
+    if summaries_for_repo:
+        logger.info('Finished repository %s: %d project folder(s)', repo_name, len(summaries_for_repo))
+    else:
+        logger.info('No relevant source files found in repository %s', repo_name)
+    return summaries_for_repo
+
+
 def process_repos(root_folder: str, logger: logging.Logger):
     """Walk through *root_folder* and return a mapping {repo_name: [project_summaries]}"""
     logger.info('Starting repository scan in %s', root_folder)
     repo_summaries: dict[str, list] = {}
 
     # First‑level iteration: each directory directly under root is treated as a repo
-    for repo_name in os.listdir(root_folder):
-        repo_path = os.path.join(root_folder, repo_name)
-        if not os.path.isdir(repo_path):
-            logger.debug('Skipping non-directory entry: %s', repo_path)
-            continue
-
-        logger.debug('Processing repository: %s', repo_name)
-        summaries_for_repo: list[dict] = []
-        for root, dirs, files in os.walk(repo_path):
-            # Skip excluded sub‑directories in‑place
-            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-
-            relevant_files = [f for f in files if is_source_file(f)]
-            if relevant_files:
-                rel_path = os.path.relpath(root, repo_path)
-                full_project_path = os.path.join(repo_path, rel_path)
-                logger.debug('Found project folder with source files: %s', full_project_path)
-                snippets = gather_code_snippets(full_project_path, logger)
-                if snippets:
-                    project_summary = {
-                        'repo': repo_name,
-                        'folder': rel_path,
-                        'code_files': [os.path.join(rel_path, f) for f in relevant_files],
-                        'snippets': snippets
-                    }
-                    summaries_for_repo.append(project_summary)
-                    logger.info('Added summary for project %s/%s (snippets=%d)',
-                                repo_name, rel_path, len(snippets))
-        if summaries_for_repo:
-            repo_summaries[repo_name] = summaries_for_repo
-            logger.info('Finished repository %s: %d project folder(s)', repo_name, len(summaries_for_repo))
-        else:
-            logger.info('No relevant source files found in repository %s', repo_name)
+    repo_dirs: list[tuple[str, str]] = []
+    with os.scandir(root_folder) as it:
+        for entry in it:
+            if entry.is_dir():
+                repo_dirs.append((entry.name, entry.path))
+            else:
+                logger.debug('Skipping non-directory entry: %s', entry.path)
+
+    # Scanning is disk‑bound and file reads release the GIL, so repos are scanned
+    # side by side; map() keeps the results in directory order
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+        results = pool.map(lambda repo: scan_repo(*repo, logger), repo_dirs)
+        for (repo_name, _), summaries_for_repo in zip(repo_dirs, results):
+            if summaries_for_repo:
+                repo_summaries[repo_name] = summaries_for_repo
 
     logger.info('Repository scan completed. Total repositories summarised: %d', len(repo_summaries))
     return repo_summaries
@@ -118,8 +194,12 @@ def write_repo_json(repo_name: str, summaries: list[dict], out_dir: Path, logger
     """Write the *summaries* list to <out_dir>/<repo_name>.json"""
     out_dir.mkdir(parents=True, exist_ok=True)
     file_path = out_dir / f"{repo_name}.json"
-    with open(file_path, 'w', encoding='utf-8') as fp:
-        json.dump(summaries, fp, indent=2)
+    if orjson:
+        file_path.write_bytes(orjson.dumps(summaries, option=orjson.OPT_INDENT_2))
+    else:
+        with open(file_path, 'w', encoding='utf-8') as fp:
+            # raw UTF-8 like orjson, so the file doesn't depend on which one ran
+            json.dump(summaries, fp, indent=2, ensure_ascii=False)
     logger.info('🔸 Wrote %d project summary(ies) to %s', len(summaries), file_path)
 
 
@@ -134,8 +214,10 @@ def main() -> None:
 
         repo_summaries = process_repos(GITHUB_REPOS_ROOT, logger)
         output_path = Path(OUTPUT_DIR)
-        for repo_name, summaries in repo_summaries.items():
-            write_repo_json(repo_name, summaries, output_path, logger)
+        # each repository's file is independent; list() re‑raises the first write error
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool:
+            list(pool.map(lambda item: write_repo_json(*item, output_path, logger),
+                          repo_summaries.items()))
 
         logger.info('===== Project summarisation finished (repositories written: %d) =====',
                     len(repo_summaries))
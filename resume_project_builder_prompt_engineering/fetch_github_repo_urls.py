@@ -9,24 +9,40 @@ If you omit the command‑line argument the script falls back to the USERNAME
 constant below.  It writes two files:
   • repos.json      – the full GitHub API response (every repo field)
   • repo_links.json – just "name" and "html_url" for each repo
+
+Each page's ETag / Last‑Modified is remembered in .github_cache.json, so a
+re‑run sends conditional requests; pages answered with 304 Not Modified cost
+no rate‑limit quota, and if nothing changed the output files are left as is.
 """
 
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: C/SIMD JSON codec, several times faster than json
+except ImportError:
+    orjson = None
 
 # ---------------------------- Configuration ---------------------------- #
 
 USERNAME       = "meechtheballer99"         # default; can be overridden by argv
 API_ROOT       = "https://api.github.com"
-HEADERS        = {"Accept": "application/vnd.github+json"}  # good practice
+HEADERS        = {"Accept": "application/vnd.github+json",  # good practice
+                  "X-GitHub-Api-Version": "2022-11-28"}
 PARAMS         = {"per_page": 100, "type": "public"}        # 100 = API max
 FULL_OUTPUT    = Path("repos.json")
 LINKS_OUTPUT   = Path("repo_links.json")
+CACHE_FILE     = Path(".github_cache.json")  # per-page ETag + body from the last run
 BACKOFF_SECS   = 1.0    # naive back‑off if we ever hit secondary rate limits
+PAGE_WORKERS   = 8      # pages 2..N are fetched concurrently once the last page is known
 
 # If you have a Personal Access Token, uncomment the next line and replace
 # 'YOUR_TOKEN' – this lifts you to higher rate‑limit ceilings.
@@ -34,29 +50,107 @@ BACKOFF_SECS   = 1.0    # naive back‑off if we ever hit secondary rate limits
 
 # --------------------------- Helper Functions -------------------------- #
 
-def fetch_all_repos(username: str) -> list[dict]:
-    """Walk through every paginated result and return a list of repos."""
-    repos: list[dict] = []
-    url, params = f"{API_ROOT}/users/{username}/repos", PARAMS
-
-    while url:
-        resp = requests.get(url, headers=HEADERS, params=params)
+def load_cache(path: Path) -> dict:
+    """Return the page cache from the previous run (empty if missing or unreadable)."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def make_session() -> requests.Session:
+    """One keep‑alive session for every page; transient 5xx answers are retried."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
+
+def fetch_page(session: requests.Session, url: str, cached: dict | None) -> tuple[dict, bool]:
+    """
+    GET one page, conditionally if *cached* holds its ETag / Last‑Modified.
+    Returns (entry, changed); *entry* is the page's cache record
+    {"etag", "last_modified", "next", "last", "body"}.
+    """
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    while True:
+        resp = session.get(url, headers=headers)
         # Handle the odd 403 from secondary rate limits with a tiny nap + retry
         if resp.status_code == 403 and "secondary rate limit" in resp.text.lower():
             time.sleep(BACKOFF_SECS)
             continue
+        break
+
+    if resp.status_code == 304:
+        return cached, False
+    resp.raise_for_status()
+    # GitHub encodes pagination URLs in the Link header
+    return {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "next": resp.links.get("next", {}).get("url"),  # None when we're done
+        "last": resp.links.get("last", {}).get("url"),
+        "body": orjson.loads(resp.content) if orjson else resp.json(),
+    }, True
+
+def page_urls(last_url: str) -> list[str]:
+    """URLs of pages 2..N, built from the rel="last" link (…&page=N)."""
+    parts = urlsplit(last_url)
+    query = dict(parse_qsl(parts.query))
+    return [
+        urlunsplit(parts._replace(query=urlencode({**query, "page": n})))
+        for n in range(2, int(query["page"]) + 1)
+    ]
+
+def fetch_all_repos(session: requests.Session, username: str, cache: dict) -> tuple[list[dict], bool]:
+    """
+    Fetch every paginated result and return (repos, changed).
+
+    *cache* maps page URL → page record (see fetch_page) and is updated in
+    place; pages GitHub answers with 304 are served from it. Once the first
+    page names the last one, the rest are requested concurrently.
+    """
+    first_url = requests.Request("GET", f"{API_ROOT}/users/{username}/repos", params=PARAMS).prepare().url
+
+    def fetch(url: str) -> tuple[str, dict, bool]:
+        return (url, *fetch_page(session, url, cache.get(url)))
+
+    pages = [fetch(first_url)]
+    if pages[0][1].get("last"):
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+            pages += pool.map(fetch, page_urls(pages[0][1]["last"]))
+    # Follow rel="next" past whatever we have: covers a single‑page list, a page 1
+    # cached before "last" was recorded, and pages added since the last run
+    fetched = {url for url, _, _ in pages}
+    while (next_url := pages[-1][1].get("next")) and next_url not in fetched:
+        pages.append(fetch(next_url))
+        fetched.add(next_url)
 
-        resp.raise_for_status()
-        repos.extend(resp.json())
+    repos: list[dict] = []
+    changed = False
+    for url, entry, page_changed in pages:
+        cache[url] = entry
+        repos.extend(entry["body"])
+        changed |= page_changed
 
-        # GitHub encodes pagination URLs in the Link header
-        url = resp.links.get("next", {}).get("url")  # None when we're done
-        params = None  # subsequent URLs already contain ?per_page=… etc.
+    # Forget pages that no longer exist (e.g. the repo list got shorter)
+    for stale in set(cache) - fetched:
+        del cache[stale]
+        changed = True
 
-    return repos
+    return repos, changed
 
 def save_json(data: object, path: Path) -> None:
-    path.write_text(json.dumps(data, indent=2, sort_keys=True))
+    if orjson:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    else:
+        # json.dump writes encoded chunks as it goes instead of building one big string
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump(data, fp, indent=2, sort_keys=True)
     print(f"💾  Wrote {path}")
 
 # ------------------------------ Main ----------------------------------- #
@@ -65,9 +159,15 @@ def main() -> None:
     user = sys.argv[1] if len(sys.argv) > 1 else USERNAME
     print(f"🔍 Fetching public repos for '{user}' …")
 
-    repos = fetch_all_repos(user)
+    cache = load_cache(CACHE_FILE)
+    with make_session() as session:
+        repos, changed = fetch_all_repos(session, user, cache)
     print(f"✅ Retrieved {len(repos)} repositories")
 
+    if not changed and FULL_OUTPUT.exists() and LINKS_OUTPUT.exists():
+        print("🟰  Repository list unchanged since last run – output files left as is")
+        return
+
     # Full JSON payload
     save_json(repos, FULL_OUTPUT)
 
@@ -75,5 +175,7 @@ def main() -> None:
     repo_links = [{"name": r["name"], "url": r["html_url"]} for r in repos]
     save_json(repo_links, LINKS_OUTPUT)
 
+    CACHE_FILE.write_text(json.dumps(cache), encoding="utf-8")
+
 if __name__ == "__main__":
     main()